@@ -2,6 +2,7 @@
 """st3215 extension builder and installer"""
 
 import io
+import os
 import sys
 
 import setuptools
@@ -42,6 +43,14 @@ install_require = []
 with io.open("requirements.txt") as f:
     install_require = [l.strip() for l in f if not l.startswith("#")]
 
+# Optional: ST3215_MYPYC=1 compiles the sync read parser and the payload
+# packing to C extensions (requires mypy). They are kept in their own modules
+# for that purpose; the pure Python modules are used when they are not built.
+ext_modules = []
+if os.environ.get("ST3215_MYPYC"):
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["--ignore-missing-imports", "st3215/_parse.py", "st3215/_pack.py"])
+
 setup_params = dict(
     name=name,
     version="0.0.1",
@@ -53,6 +62,7 @@ setup_params = dict(
     url=url,
     license=license,
     packages=packages,
+    ext_modules=ext_modules,
     include_package_data=True,
     install_requires=install_require,
     tests_require=test_require,
@@ -0,0 +1,21 @@
+"""Pack register values into the bytes written to a servo.
+
+sts_end selects the byte order like protocol_packet_handler.sts_end:
+0 (STS, the ST3215 default) is little endian, anything else big endian.
+"""
+
+import struct
+
+_WORD = (struct.Struct('<H'), struct.Struct('>H'))
+# STS_ACC, STS_GOAL_POSITION_L/H, STS_GOAL_TIME_L/H, STS_GOAL_SPEED_L/H
+_MOVE = (struct.Struct('<BHHH'), struct.Struct('>BHHH'))
+
+
+def pack_word(value: int, sts_end: int = 0) -> bytes:
+    # 16 bit register value in the servo byte order
+    return _WORD[sts_end != 0].pack(value & 0xFFFF)
+
+
+def pack_move(acc: int, speed: int, position: int, sts_end: int = 0) -> bytes:
+    # 7 bytes block written from STS_ACC, goal time left to 0
+    return _MOVE[sts_end != 0].pack(acc, position & 0xFFFF, 0, speed & 0xFFFF)
@@ -0,0 +1,33 @@
+"""Find and check the status packet of one servo in a sync read reply."""
+
+from .values import COMM_SUCCESS, COMM_RX_CORRUPT
+
+# FF FF <id> status packet header of every possible ID, built once at import
+_STATUS_HEADER = [b'\xff\xff' + bytes((sts_id,)) for sts_id in range(256)]
+
+
+def parse_sync_read(rxpacket, rx_length: int, sts_id: int, data_length: int) -> tuple[int, int]:
+    # Locate the status packet of sts_id in a sync read reply and verify it.
+    # Returns the index of its error byte (the data follows) and the COMM result.
+    # rxpacket is a bytes-like buffer of which only the first rx_length bytes
+    # are valid: the header search (find) and the checksum (sum) both run in C
+    # instead of one byte per loop turn
+    header = _STATUS_HEADER[sts_id]
+    mv = memoryview(rxpacket)
+    rx_index = 0
+    while (rx_index+6+data_length) <= rx_length:
+        pos = rxpacket.find(header, rx_index, rx_length)
+        if pos < 0 or (pos+6+data_length) > rx_length:
+            break
+        if rxpacket[pos+3] != (data_length+2):
+            rx_index = pos + 1
+            continue
+        Error = rxpacket[pos+4]
+        body_start = pos + 5
+        # slicing the memoryview sums the payload without copying it
+        calSum = (sts_id + (data_length+2) + Error + sum(mv[body_start : body_start+data_length])) & 0xFF
+        calSum ^= 0xFF
+        if calSum != rxpacket[body_start+data_length]:
+            return -1, COMM_RX_CORRUPT
+        return pos + 4, COMM_SUCCESS
+    return -1, COMM_RX_CORRUPT
@@ -1,4 +1,5 @@
 from .values import *
+from ._parse import parse_sync_read
 
 class GroupSyncRead:
     def __init__(self, ph, start_address, data_length):
@@ -7,28 +8,19 @@ class GroupSyncRead:
         self.data_length = data_length
 
         self.last_result = False
-        self.is_param_changed = False
-        self.param = []
+        self.param = bytearray()
         self.data_dict = {}
+        self.available = set()
 
         self.clearParam()
 
-    def makeParam(self):
-        if not self.data_dict:  # len(self.data_dict.keys()) == 0:
-            return
-
-        self.param = []
-
-        for scs_id in self.data_dict:
-            self.param.append(scs_id)
-
     def addParam(self, sts_id):
         if sts_id in self.data_dict:  # sts_id already exist
             return False
 
-        self.data_dict[sts_id] = []  # [0] * self.data_length
+        self.data_dict[sts_id] = bytearray(self.data_length + 1)  # [error] + data
+        self.param.append(sts_id)
 
-        self.is_param_changed = True
         return True
 
     def removeParam(self, sts_id):
@@ -36,39 +28,46 @@ class GroupSyncRead:
             return
 
         del self.data_dict[sts_id]
-
-        self.is_param_changed = True
+        self.available.discard(sts_id)
+        self.param.remove(sts_id)
 
     def clearParam(self):
         self.data_dict.clear()
+        self.available.clear()
+        self.param.clear()
 
     def txPacket(self):
-        if len(self.data_dict.keys()) == 0:
-
+        n = len(self.data_dict)
+        if n == 0:
             return COMM_NOT_AVAILABLE
 
-        if self.is_param_changed is True or not self.param:
-            self.makeParam()
-
-        return self.ph.syncReadTx(self.start_address, self.data_length, self.param, len(self.data_dict.keys()))
+        return self.ph.syncReadTx(self.start_address, self.data_length, self.param, n)
 
     def rxPacket(self):
         self.last_result = True
 
         result = COMM_RX_FAIL
 
-        if len(self.data_dict.keys()) == 0:
+        n = len(self.data_dict)
+        if n == 0:
             return COMM_NOT_AVAILABLE
 
-        result, rxpacket = self.ph.syncReadRx(self.data_length, len(self.data_dict.keys()))
+        # rxpacket is the port's reusable buffer, only its first rx_length bytes are valid
+        result, rxpacket, rx_length = self.ph.syncReadRx(self.data_length, n)
         # print(rxpacket)
-        if len(rxpacket) >= (self.data_length+6):
-            for sts_id in self.data_dict:
-                self.data_dict[sts_id], result = self.readRx(rxpacket, sts_id, self.data_length)
-                if result != COMM_SUCCESS:
+        if rx_length >= (self.data_length+6):
+            # self.param already holds the IDs in insertion order
+            for sts_id in self.param:
+                _, result = self.readRx(rxpacket, sts_id, self.data_length, rx_length)
+                if result == COMM_SUCCESS:
+                    self.available.add(sts_id)
+                else:
+                    self.available.discard(sts_id)
                     self.last_result = False
                 # print(sts_id)
         else:
+            # short reply or timeout: nothing from a previous cycle is valid anymore
+            self.available.clear()
             self.last_result = False
         # print(self.last_result)
         return result
@@ -76,50 +75,23 @@ class GroupSyncRead:
     def txRxPacket(self):
         result = self.txPacket()
         if result != COMM_SUCCESS:
+            self.available.clear()
             return result
 
         return self.rxPacket()
 
-    def readRx(self, rxpacket, sts_id, data_length):
-        # print(sts_id)
-        # print(rxpacket)
-        data = []
-        rx_length = len(rxpacket)
-        # print(rx_length)
-        rx_index = 0;
-        while (rx_index+6+data_length) <= rx_length:
-            headpacket = [0x00, 0x00, 0x00]
-            while rx_index < rx_length:
-                headpacket[2] = headpacket[1];
-                headpacket[1] = headpacket[0];
-                headpacket[0] = rxpacket[rx_index];
-                rx_index += 1
-                if (headpacket[2] == 0xFF) and (headpacket[1] == 0xFF) and headpacket[0] == sts_id:
-                    # print(rx_index)
-                    break
-            # print(rx_index+3+data_length)
-            if (rx_index+3+data_length) > rx_length:
-                break;
-            if rxpacket[rx_index] != (data_length+2):
-                rx_index += 1
-                # print(rx_index)
-                continue
-            rx_index += 1
-            Error = rxpacket[rx_index]
-            rx_index += 1
-            calSum = sts_id + (data_length+2) + Error
-            data = [Error]
-            data.extend(rxpacket[rx_index : rx_index+data_length])
-            for i in range(0, data_length):
-                calSum += rxpacket[rx_index]
-                rx_index += 1
-            calSum = ~calSum & 0xFF
-            # print(calSum)
-            if calSum != rxpacket[rx_index]:
-                return None, COMM_RX_CORRUPT
-            return data, COMM_SUCCESS 
-        # print(rx_index)
-        return None, COMM_RX_CORRUPT
+    def readRx(self, rxpacket, sts_id, data_length, rx_length=None):
+        if rx_length is None:
+            rx_length = len(rxpacket)
+        index, result = parse_sync_read(rxpacket, rx_length, sts_id, data_length)
+        if result != COMM_SUCCESS:
+            return None, result
+        # fill the servo's preallocated buffer instead of building a new one
+        data = self.data_dict.get(sts_id)
+        if data is None or len(data) != (data_length+1):
+            data = bytearray(data_length+1)
+        data[:] = memoryview(rxpacket)[index : index+1+data_length]  # error byte + data
+        return data, COMM_SUCCESS
 
     def isAvailable(self, sts_id, address, data_length):
         #if self.last_result is False or sts_id not in self.data_dict:
@@ -128,22 +100,30 @@ class GroupSyncRead:
 
         if (address < self.start_address) or (self.start_address + self.data_length - data_length < address):
             return False, 0
-        if not self.data_dict[sts_id]:
-            return False, 0
-        if len(self.data_dict[sts_id])<(data_length+1):
+        if sts_id not in self.available:
             return False, 0
         return True, self.data_dict[sts_id][0]
 
     def getData(self, sts_id, address, data_length):
+        offset = address - self.start_address + 1
+        if self.ph.sts_end == 0:
+            # STS byte order is little endian, so one from_bytes call decodes any field length
+            return int.from_bytes(self.data_dict[sts_id][offset : offset+data_length], 'little')
+        # bind the buffer and helpers once rather than looking them up per byte
+        data = self.data_dict[sts_id]
+        makeword = self.ph.sts_makeword
         if data_length == 1:
-            return self.data_dict[sts_id][address-self.start_address+1]
+            return data[offset]
         elif data_length == 2:
-            return self.ph.sts_makeword(self.data_dict[sts_id][address-self.start_address+1],
-                                self.data_dict[sts_id][address-self.start_address+2])
+            return makeword(data[offset], data[offset+1])
         elif data_length == 4:
-            return self.ph.sts_makedword(self.ph.sts_makeword(self.data_dict[sts_id][address-self.start_address+1],
-                                              self.data_dict[sts_id][address-self.start_address+2]),
-                                 self.ph.sts_makeword(self.data_dict[sts_id][address-self.start_address+3],
-                                              self.data_dict[sts_id][address-self.start_address+4]))
+            return self.ph.sts_makedword(makeword(data[offset], data[offset+1]),
+                                         makeword(data[offset+2], data[offset+3]))
         else:
             return 0
+
+    def getDataBlock(self, sts_id, address, data_length):
+        # zero-copy view of several consecutive registers, e.g.
+        # struct.unpack_from('<HHHB', group.getDataBlock(sts_id, STS_PRESENT_POSITION_L, 7))
+        offset = address - self.start_address + 1
+        return memoryview(self.data_dict[sts_id])[offset : offset+data_length]
@@ -7,7 +7,8 @@ class GroupSyncWrite:
         self.data_length = data_length
 
         self.is_param_changed = False
-        self.param = []
+        self.param = bytearray()
+        self.param_offset = {}
         self.data_dict = {}
 
         self.clearParam()
@@ -16,15 +17,19 @@ class GroupSyncWrite:
         if not self.data_dict:
             return
 
-        self.param = []
+        self.param = bytearray()
+        self.param_offset = {}
 
         for sts_id in self.data_dict:
             if not self.data_dict[sts_id]:
                 return
 
             self.param.append(sts_id)
+            self.param_offset[sts_id] = len(self.param)
             self.param.extend(self.data_dict[sts_id])
 
+        self.is_param_changed = False
+
     def addParam(self, sts_id, data):
         if sts_id in self.data_dict:  # sts_id already exist
             return False
@@ -54,18 +59,24 @@ class GroupSyncWrite:
 
         self.data_dict[sts_id] = data
 
-        self.is_param_changed = True
+        if not self.is_param_changed and sts_id in self.param_offset and len(data) == self.data_length:
+            # patch the servo's slice of the cached param in place
+            offset = self.param_offset[sts_id]
+            self.param[offset:offset+self.data_length] = bytes(data)
+        else:
+            self.is_param_changed = True
         return True
 
     def clearParam(self):
         self.data_dict.clear()
 
     def txPacket(self):
-        if len(self.data_dict.keys()) == 0:
+        n = len(self.data_dict)
+        if n == 0:
             return COMM_NOT_AVAILABLE
 
         if self.is_param_changed is True or not self.param:
             self.makeParam()
 
         return self.ph.syncWriteTxOnly(self.start_address, self.data_length, self.param,
-                                       len(self.data_dict.keys()) * (1 + self.data_length))
+                                       n * (1 + self.data_length))
@@ -1,6 +1,5 @@
 import time
 import serial
-import sys
 
 from .values import *
 
@@ -9,13 +8,14 @@ class PortHandler(object):
     def __init__(self, port_name):
         self.is_open = False
         self.baudrate = DEFAULT_BAUDRATE
-        self.packet_start_time = 0.0
-        self.packet_timeout = 0.0
+        self.packet_start_ns = 0
+        self.packet_timeout_ns = 0
         self.tx_time_per_byte = 0.0
 
         self.is_using = False
         self.port_name = port_name
         self.ser = None
+        self.rx_buf = bytearray()
 
     def openPort(self):
         return self.setupPort()
@@ -27,6 +27,10 @@ class PortHandler(object):
     def clearPort(self):
         self.ser.flush()
 
+    def clearInput(self):
+        # drop the bytes received but not read yet
+        self.ser.reset_input_buffer()
+
     def setPortName(self, port_name):
         self.port_name = port_name
 
@@ -40,38 +44,53 @@ class PortHandler(object):
         return self.ser.in_waiting
 
     def readPort(self, length):
-        if (sys.version_info > (3, 0)):
-            return self.ser.read(length)
-        else:
-            return [ord(ch) for ch in self.ser.read(length)]
+        return self.ser.read(length)
+
+    def readInto(self, buf):
+        return self.ser.readinto(buf)
+
+    def readUntilLength(self, length):
+        # drain whatever is already buffered straight into the reusable rx_buf
+        # until length bytes arrived or the packet timeout expired. rx_buf only
+        # grows: the caller gets rx_buf itself with the number of bytes received,
+        # and its content is overwritten by the next call.
+        buf = self.rx_buf
+        if len(buf) < length:
+            buf.extend(bytes(length - len(buf)))
+        rx_length = 0
+        with memoryview(buf) as view:
+            while rx_length < length:
+                n = self.ser.in_waiting
+                if n:
+                    rx_length += self.readInto(view[rx_length : min(length, rx_length + n)])
+                elif self.isPacketTimeout():
+                    break
+        return buf, rx_length
 
     def writePort(self, packet):
         return self.ser.write(packet)
 
     def setPacketTimeout(self, packet_length):
-        self.packet_start_time = self.getCurrentTime()
-        self.packet_timeout = (self.tx_time_per_byte * packet_length) + (self.tx_time_per_byte * 3.0) + LATENCY_TIMER
+        self.packet_start_ns = time.monotonic_ns()
+        self.packet_timeout_ns = int(((self.tx_time_per_byte * packet_length) + (self.tx_time_per_byte * 3.0) + LATENCY_TIMER) * 1000000)
 
     def setPacketTimeoutMillis(self, msec):
-        self.packet_start_time = self.getCurrentTime()
-        self.packet_timeout = msec
+        self.packet_start_ns = time.monotonic_ns()
+        self.packet_timeout_ns = int(msec * 1000000)
 
     def isPacketTimeout(self):
-        if self.getTimeSinceStart() > self.packet_timeout:
-            self.packet_timeout = 0
+        # integer nanoseconds on a monotonic clock: no float math and no wall clock jumps
+        if (time.monotonic_ns() - self.packet_start_ns) > self.packet_timeout_ns:
+            self.packet_timeout_ns = 0
             return True
 
         return False
 
     def getCurrentTime(self):
-        return round(time.time() * 1000000000) / 1000000.0
+        return time.monotonic_ns() / 1000000.0
 
     def getTimeSinceStart(self):
-        time_since = self.getCurrentTime() - self.packet_start_time
-        if time_since < 0.0:
-            self.packet_start_time = self.getCurrentTime()
-
-        return time_since
+        return (time.monotonic_ns() - self.packet_start_ns) / 1000000.0
 
     def setupPort(self):
         if self.is_open:
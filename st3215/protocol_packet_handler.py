@@ -1,5 +1,30 @@
 from .values import *
 
+TXRX_RESULT_MSG = {
+    COMM_SUCCESS: "[TxRxResult] Communication success!",
+    COMM_PORT_BUSY: "[TxRxResult] Port is in use!",
+    COMM_TX_FAIL: "[TxRxResult] Failed transmit instruction packet!",
+    COMM_RX_FAIL: "[TxRxResult] Failed get status packet from device!",
+    COMM_TX_ERROR: "[TxRxResult] Incorrect instruction packet!",
+    COMM_RX_WAITING: "[TxRxResult] Now receiving status packet!",
+    COMM_RX_TIMEOUT: "[TxRxResult] There is no status packet!",
+    COMM_RX_CORRUPT: "[TxRxResult] Incorrect status packet!",
+    COMM_NOT_AVAILABLE: "[TxRxResult] Protocol does not support this function!",
+}
+
+# first matching message wins, in this priority order
+RX_PACKET_ERROR_BITS = (
+    (ERRBIT_VOLTAGE, "[ServoStatus] Input voltage error!"),
+    (ERRBIT_ANGLE, "[ServoStatus] Angle sen error!"),
+    (ERRBIT_OVERHEAT, "[ServoStatus] Overheat error!"),
+    (ERRBIT_OVERELE, "[ServoStatus] OverEle error!"),
+    (ERRBIT_OVERLOAD, "[ServoStatus] Overload error!"),
+)
+
+# one precomputed message per value of the masked error byte
+RX_PACKET_ERROR_MSG = [next((msg for bit, msg in RX_PACKET_ERROR_BITS if error & bit), "")
+                       for error in range(ERRBIT_MASK + 1)]
+
 class protocol_packet_handler(object):
     def __init__(self, portHandler):
         #self.sts_setend(protocol_end)# STServo bit end(STS/SMS=0, SCS=1)
@@ -55,47 +80,12 @@ class protocol_packet_handler(object):
         return 1.0
 
     def getTxRxResult(self, result):
-        if result == COMM_SUCCESS:
-            return "[TxRxResult] Communication success!"
-        elif result == COMM_PORT_BUSY:
-            return "[TxRxResult] Port is in use!"
-        elif result == COMM_TX_FAIL:
-            return "[TxRxResult] Failed transmit instruction packet!"
-        elif result == COMM_RX_FAIL:
-            return "[TxRxResult] Failed get status packet from device!"
-        elif result == COMM_TX_ERROR:
-            return "[TxRxResult] Incorrect instruction packet!"
-        elif result == COMM_RX_WAITING:
-            return "[TxRxResult] Now receiving status packet!"
-        elif result == COMM_RX_TIMEOUT:
-            return "[TxRxResult] There is no status packet!"
-        elif result == COMM_RX_CORRUPT:
-            return "[TxRxResult] Incorrect status packet!"
-        elif result == COMM_NOT_AVAILABLE:
-            return "[TxRxResult] Protocol does not support this function!"
-        else:
-            return ""
+        return TXRX_RESULT_MSG.get(result, "")
 
     def getRxPacketError(self, error):
-        if error & ERRBIT_VOLTAGE:
-            return "[ServoStatus] Input voltage error!"
-
-        if error & ERRBIT_ANGLE:
-            return "[ServoStatus] Angle sen error!"
-
-        if error & ERRBIT_OVERHEAT:
-            return "[ServoStatus] Overheat error!"
-
-        if error & ERRBIT_OVERELE:
-            return "[ServoStatus] OverEle error!"
-        
-        if error & ERRBIT_OVERLOAD:
-            return "[ServoStatus] Overload error!"
-
-        return ""
+        return RX_PACKET_ERROR_MSG[error & ERRBIT_MASK]
 
     def txPacket(self, txpacket):
-        checksum = 0
         total_packet_length = txpacket[PKT_LENGTH] + 4  # 4: HEADER0 HEADER1 ID LENGTH
 
         if self.portHandler.is_using:
@@ -112,14 +102,13 @@ class protocol_packet_handler(object):
         txpacket[PKT_HEADER_1] = 0xFF
 
         # add a checksum to the packet
-        for idx in range(2, total_packet_length - 1):  # except header, checksum
-            checksum += txpacket[idx]
+        checksum = sum(txpacket[2:total_packet_length - 1])  # except header, checksum
 
         txpacket[total_packet_length - 1] = ~checksum & 0xFF
 
         #print "[TxPacket] %r" % txpacket
 
-        # tx packet
+        # tx packet: the whole frame goes out in a single write
         self.portHandler.clearPort()
         written_packet_length = self.portHandler.writePort(txpacket)
         if total_packet_length != written_packet_length:
@@ -454,7 +443,10 @@ class protocol_packet_handler(object):
         return result, error
 
     def syncReadTx(self, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 8)
+        if param_length + 8 > TXPACKET_MAX_LEN:
+            return COMM_TX_ERROR
+
+        txpacket = bytearray(param_length + 8)
         # 8: HEADER0 HEADER1 ID LEN INST START_ADDR DATA_LEN CHKSUM
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -472,27 +464,21 @@ class protocol_packet_handler(object):
     def syncReadRx(self, data_length, param_length):
         wait_length = (6 + data_length) * param_length
         self.portHandler.setPacketTimeout(wait_length)
-        rxpacket = []
-        rx_length = 0
-        while True:
-            rxpacket.extend(self.portHandler.readPort(wait_length - rx_length))
-            rx_length = len(rxpacket)
-            if rx_length >= wait_length:
-                result = COMM_SUCCESS
-                break
-            else:
-                # check timeout
-                if self.portHandler.isPacketTimeout():
-                    if rx_length == 0:
-                        result = COMM_RX_TIMEOUT
-                    else:
-                        result = COMM_RX_CORRUPT
-                    break
+        rxpacket, rx_length = self.portHandler.readUntilLength(wait_length)
+        if rx_length >= wait_length:
+            result = COMM_SUCCESS
+        elif rx_length == 0:
+            result = COMM_RX_TIMEOUT
+        else:
+            result = COMM_RX_CORRUPT
         self.portHandler.is_using = False
-        return result, rxpacket
+        return result, rxpacket, rx_length
 
     def syncWriteTxOnly(self, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 8)
+        if param_length + 8 > TXPACKET_MAX_LEN:
+            return COMM_TX_ERROR
+
+        txpacket = bytearray(param_length + 8)
         # 8: HEADER0 HEADER1 ID LEN INST START_ADDR DATA_LEN ... CHKSUM
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -7,10 +7,25 @@ from .protocol_packet_handler import *
 from .group_sync_write import *
 from .group_sync_read import *
 from .values import *
+from ._pack import pack_word, pack_move
 
 
 __all__ = ['ST3215']
 
+_CORR_MAG_MASK = 0x07FF
+_CORR_SIGN_BIT = 0x0800
+
+_MIN_MOVE_DURATION = 0.2  # s, shortest budget given to _waitMove
+
+# constant STS_TORQUE_ENABLE payloads, shared by every call
+_TX_TORQUE_OFF = bytes((0,))
+_TX_TORQUE_ON = bytes((1,))
+_TX_TORQUE_NEUTRAL = bytes((128,))  # set the current position as 2048
+
+# STS_STATUS bit i set means the matching sensor reports a fault
+_STATUS_BITS = ["Voltage", "Sensor", "Temperature", "Current", "Angle", "Overload"]
+_STATUS_TABLE = [{name: not (b & (1 << i)) for i, name in enumerate(_STATUS_BITS)} for b in range(64)]
+
 
 class ST3215(protocol_packet_handler):
 
@@ -24,7 +39,120 @@ class ST3215(protocol_packet_handler):
         protocol_packet_handler.__init__(self, self.portHandler)
 
         self.groupSyncWrite = GroupSyncWrite(self, STS_ACC, 7)
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()
+        self.read_cache = {}  # sts_id -> {address: (timestamp, value)}
+        self.mode_cache = {}  # sts_id -> last mode successfully set
+        self.target_cache = {}  # sts_id -> last goal position sent by MoveTo / MoveToFast
+        self.alive_cache = {}  # sts_id -> time of the last successful ping
+        self.list_cache = {}  # (first_id, last_id, stop_after) -> (timestamp, servo list)
+        self.alive_ttl = 0.5  # seconds during which PingServo trusts alive_cache (0: always ping)
+
+
+    def _readCached(self, sts_id, address, length, max_age=0):
+        """
+        Read a 1 or 2 bytes register, reusing the last value read if it is recent enough.
+
+        :param sts_id: Servo ID
+        :param address: Register address
+        :param length: Register length (1 or 2)
+        :param max_age: Maximum age in seconds of a cached value (0: always read the servo)
+
+        :return: value, communication result and servo error, like read1ByteTxRx / read2ByteTxRx
+        """
+        if max_age > 0:
+            with self.lock:
+                entry = self.read_cache.get(sts_id, {}).get(address)
+            if entry is not None and time.monotonic() - entry[0] <= max_age:
+                return entry[1], COMM_SUCCESS, 0
+
+        # the read itself is done under the lock, so it cannot land inside a locked sequence
+        with self.lock:
+            if length == 1:
+                value, comm, error = self.read1ByteTxRx(sts_id, address)
+            else:
+                value, comm, error = self.read2ByteTxRx(sts_id, address)
+
+            if comm == COMM_SUCCESS and error == 0:
+                self.read_cache.setdefault(sts_id, {})[address] = (time.monotonic(), value)
+            else:
+                self.alive_cache.pop(sts_id, None)
+        return value, comm, error
+
+
+    def InvalidateCache(self, sts_id=None):
+        """
+        Drop the cached register values of a servo.
+
+        :param sts_id: Servo ID (facultative, all servos by default)
+        """
+        with self.lock:
+            if sts_id is None or sts_id == BROADCAST_ID:
+                self.read_cache.clear()
+            else:
+                self.read_cache.pop(sts_id, None)
+
+
+    def _forgetServo(self, sts_id):
+        """
+        Drop everything known about a servo (cached registers, mode, last goal, last ping),
+        e.g. once it answers to another ID or baudrate.
+
+        :param sts_id: Servo ID
+        """
+        self.InvalidateCache(sts_id)
+        with self.lock:
+            self.mode_cache.pop(sts_id, None)
+            self.target_cache.pop(sts_id, None)
+            self.alive_cache.pop(sts_id, None)
+
+
+    def _forgetWrite(self, sts_ids, address, length):
+        """
+        Drop the last goal and, if the write covers STS_MODE, the mode known for the servos written.
+        Goal writes (MoveTo, MoveToFast, ...) record their new target after the write.
+
+        :param sts_ids: Servo IDs written (BROADCAST_ID: all servos)
+        :param address: First register address written
+        :param length: Number of bytes written
+        """
+        mode = address <= STS_MODE < address + length
+        with self.lock:
+            if BROADCAST_ID in sts_ids:
+                self.target_cache.clear()
+                if mode:
+                    self.mode_cache.clear()
+                return
+            for sts_id in sts_ids:
+                self.target_cache.pop(sts_id, None)
+                if mode:
+                    self.mode_cache.pop(sts_id, None)
+
+
+    def writeTxOnly(self, sts_id, address, length, data):
+        with self.lock:
+            self.InvalidateCache(sts_id)
+            self._forgetWrite((sts_id,), address, length)
+            return protocol_packet_handler.writeTxOnly(self, sts_id, address, length, data)
+
+
+    def writeTxRx(self, sts_id, address, length, data):
+        with self.lock:
+            self.InvalidateCache(sts_id)
+            self._forgetWrite((sts_id,), address, length)
+            comm, error = protocol_packet_handler.writeTxRx(self, sts_id, address, length, data)
+            if comm != COMM_SUCCESS:
+                self.alive_cache.pop(sts_id, None)
+        return comm, error
+
+
+    def syncWriteTxOnly(self, start_address, data_length, param, param_length):
+        # param is [ID, data...] per servo: only the servos in the packet are invalidated
+        ids = set(param[0:param_length:data_length + 1])
+        with self.lock:
+            for sts_id in ids:
+                self.InvalidateCache(sts_id)
+            self._forgetWrite(ids, start_address, data_length)
+            return protocol_packet_handler.syncWriteTxOnly(self, start_address, data_length, param, param_length)
 
 
     def PingServo(self, sts_id):
@@ -35,102 +163,238 @@ class ST3215(protocol_packet_handler):
 
         :return: True in case of success otherwise False
         """
-        model, comm, error = self.ping(sts_id)
-        if comm != COMM_SUCCESS or model == 0 or error != 0:
-            return False
-        return True
+        # a servo that answered a ping less than alive_ttl ago is not pinged again
+        seen = self.alive_cache.get(sts_id)
+        if seen is not None and time.monotonic() - seen < self.alive_ttl:
+            return True
+
+        return self._pingServo(sts_id)
+
+
+    def _pingServo(self, sts_id):
+        # always ping the servo (the bus scans must not trust alive_cache), then record the answer
+        with self.lock:
+            model, comm, error = self.ping(sts_id)
+            alive = comm == COMM_SUCCESS and model != 0 and error == 0
+            if alive:
+                self.alive_cache[sts_id] = time.monotonic()
+            else:
+                self.alive_cache.pop(sts_id, None)
+        return alive
 
 
-    def ListServos(self):
+    def ListServos(self, first_id=0, last_id=253, stop_after=None, max_age=0):
         """
         Scan the bus to determine all servo present
 
+        :param first_id: First ID to ping (facultative, 0 by default)
+        :param last_id: Last ID to ping (facultative, 253 by default)
+        :param stop_after: Stop the scan once this number of servos has been found (facultative, None by default: scan the whole range)
+        :param max_age: Accept the result of a previous identical scan up to this age in seconds (facultative, 0 by default: always scan the bus)
+
         :return: A list of servo ID
         """
+        key = (first_id, last_id, stop_after)
+        if max_age > 0:
+            with self.lock:
+                entry = self.list_cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= max_age:
+                return list(entry[1])
+
         servos=[]
-        for id in range(0, 254):
-            if self.PingServo(id):
+        for id in range(first_id, last_id + 1):
+            if self._pingServo(id):
                 servos.append(id)
+                if stop_after and len(servos) >= stop_after:
+                    break
 
+        with self.lock:
+            self.list_cache[key] = (time.monotonic(), list(servos))
         return servos
 
 
-    def ReadLoad(self, sts_id):
+    def InvalidateListCache(self):
+        """
+        Drop the bus scan results kept by ListServos.
+        """
+        with self.lock:
+            self.list_cache.clear()
+
+
+    def ListServosFast(self, first_id=0, last_id=253, fallback=False):
+        """
+        Scan the bus with a single sync read instead of one ping per ID.
+        Every servo in the range answers the same packet with its ID register.
+
+        :param first_id: First ID to scan (facultative, 0 by default)
+        :param last_id: Last ID to scan (facultative, 253 by default)
+        :param fallback: Ping the IDs that did not answer the sync read one by one (facultative, False by default)
+
+        :return: A list of servo ID
+        """
+        ids = range(first_id, last_id + 1)
+        servos = []
+        groupSyncRead = GroupSyncRead(self, STS_ID, 1)
+
+        # one sync read per block of IDs that fits in a single instruction packet
+        block = TXPACKET_MAX_LEN - 8
+        for start in range(0, len(ids), block):
+            groupSyncRead.clearParam()
+            for sts_id in ids[start:start + block]:
+                groupSyncRead.addParam(sts_id)
+
+            with self.lock:
+                groupSyncRead.txRxPacket()
+
+            servos.extend(sts_id for sts_id in ids[start:start + block]
+                          if groupSyncRead.isAvailable(sts_id, STS_ID, 1)[0])
+
+        if fallback:
+            found = set(servos)
+            servos.extend(sts_id for sts_id in ids if sts_id not in found and self._pingServo(sts_id))
+            servos.sort()
+
+        return servos
+
+
+    async def ListServosAsync(self, first_id=0, last_id=253, fallback=False):
+        """
+        Same as ListServosFast, but runs the scan in a worker thread so an asyncio event loop is not blocked
+
+        :param first_id: First ID to scan (facultative, 0 by default)
+        :param last_id: Last ID to scan (facultative, 253 by default)
+        :param fallback: Ping the IDs that did not answer the sync read one by one (facultative, False by default)
+
+        :return: A list of servo ID
+        """
+        # imported here: asyncio is slow to import and only this wrapper needs it
+        import asyncio
+        return await asyncio.to_thread(self.ListServosFast, first_id, last_id, fallback)
+
+
+    def ReadLoadRaw(self, sts_id, max_age=0):
+        """
+        Raw value of the load register, without sign decoding.
+
+        :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
+
+        :return: register value (bit 10 is the direction). None in case of error.
+        """
+        load, comm, error = self._readCached(sts_id, STS_PRESENT_LOAD_L, 2, max_age)
+        if comm == 0 and error == 0:
+            return load
+        else:
+            return None
+
+    def ReadLoad(self, sts_id, max_age=0):
         """
         Load of the servo.
         Load value is the 10 bit duty cycle of the motor controller
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: motor duty cycle +1023 to -1024. None in case of error.
         """
-        load, comm, error = self.read2ByteTxRx(sts_id, STS_PRESENT_LOAD_L)
+        load = self.ReadLoadRaw(sts_id, max_age)
+        if load is not None and load >= 1<<10:
+            load = (1<<10) - load
+        return load
+
+    def ReadVoltageRaw(self, sts_id, max_age=0):
+        """
+        Raw value of the voltage register.
+
+        :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
+
+        :return: Voltage in units of 0.1 V. None in case of error.
+        """
+        voltage, comm, error = self._readCached(sts_id, STS_PRESENT_VOLTAGE, 1, max_age)
         if comm == 0 and error == 0:
-            if load >= 1<<10:
-                load = (1<<10) - load
-            return load
+            return voltage
         else:
             return None
 
-    def ReadVoltage(self, sts_id):
+    def ReadVoltage(self, sts_id, max_age=0):
         """
         Current Voltage of the servo. 
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: Current Voltage in V. None in case of error.
         """
-        voltage, comm, error = self.read1ByteTxRx(sts_id, STS_PRESENT_VOLTAGE)
+        voltage = self.ReadVoltageRaw(sts_id, max_age)
+        if voltage is not None:
+            return voltage * VOLTAGE_SCALE
+        else:
+            return None
+
+    def ReadCurrentRaw(self, sts_id, max_age=0):
+        """
+        Raw value of the current register.
+
+        :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
+
+        :return: Current in units of 6.5 mA. None in case of error.
+        """
+        current, comm, error = self._readCached(sts_id, STS_PRESENT_CURRENT_L, 1, max_age)
         if comm == 0 and error == 0:
-            return voltage * 0.1
+            return current
         else:
             return None
 
-    def ReadCurrent(self, sts_id):
+    def ReadCurrent(self, sts_id, max_age=0):
         """
         Current current of the servo. 
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: Current current in mA. None in case of error.
         """
-        current, comm, error = self.read1ByteTxRx(sts_id, STS_PRESENT_CURRENT_L)
-        if comm == 0 and error == 0:
-            return current * 6.5
+        current = self.ReadCurrentRaw(sts_id, max_age)
+        if current is not None:
+            return current * CURRENT_SCALE
         else:
             return None
 
-    def ReadTemperature(self, sts_id):
+    def ReadTemperature(self, sts_id, max_age=0):
         """
         Current temperature of the servo. 
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: Current temperature in °C. None in case of error.
         """
-        temperature, comm, error =  self.read1ByteTxRx(sts_id, STS_PRESENT_TEMPERATURE)
+        temperature, comm, error = self._readCached(sts_id, STS_PRESENT_TEMPERATURE, 1, max_age)
         if comm == 0 and error == 0:
             return temperature
         else:
             return None
 
 
-    def ReadAccelaration(self, sts_id):
+    def ReadAccelaration(self, sts_id, max_age=0):
         """
         Current value of the acceleration of the servo. 
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: Current acceleration value. None in case of error.
         """
-        acc, comm, error =  self.read1ByteTxRx(sts_id, STS_ACC)
+        acc, comm, error = self._readCached(sts_id, STS_ACC, 1, max_age)
         if comm == 0 and error == 0:
             return acc
         else:
             return None
 
 
-    def ReadMode(self, sts_id):
+    def ReadMode(self, sts_id, max_age=0):
         """
         Current mode of the servo. 
           - 0: Position Mode
@@ -139,44 +403,45 @@ class ST3215(protocol_packet_handler):
           - 3: Step servo mode
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: Current mode. None in case of error.
         """
-        mode, comm, error =  self.read1ByteTxRx(sts_id, STS_MODE)
+        mode, comm, error = self._readCached(sts_id, STS_MODE, 1, max_age)
         if comm == 0 and error == 0:
             return mode
         else:
             return None
 
 
-    def ReadCorrection(self, sts_id):
+    def ReadCorrection(self, sts_id, max_age=0):
         """
         Current value of position correction for the servo. 
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: Current correction value. None in case of error.
         """
-        correction, comm, error =  self.read2ByteTxRx(sts_id, STS_OFS_L)
+        correction, comm, error = self._readCached(sts_id, STS_OFS_L, 2, max_age)
         if comm == 0 and error == 0:
-            mask = 0x07FFF
-            bits = correction & mask
-            if (correction & 0x0800) != 0:
-                bits = -1 * (bits & 0x7FF)
-            return bits
+            # sign-magnitude: bits 0-10 hold the value, bit 11 the sign (see CorrectPosition)
+            mag = correction & _CORR_MAG_MASK
+            return -mag if (correction & _CORR_SIGN_BIT) else mag
         else:
             return None
 
 
-    def IsMoving(self, sts_id):
+    def IsMoving(self, sts_id, max_age=0):
         """
         Is the servo moving
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: True is the servo is moving otherwise False. None in case of error.
         """
-        moving, comm, error =  self.read1ByteTxRx(sts_id, STS_MOVING)
+        moving, comm, error = self._readCached(sts_id, STS_MOVING, 1, max_age)
         if comm == 0 and error == 0:
             return bool(moving)
         else:
@@ -192,8 +457,7 @@ class ST3215(protocol_packet_handler):
 
         :return: True if the configuration a been succesfully set. None in case of error.
         """
-        txpacket = [acc]
-        comm, error = self.writeTxRx(sts_id, STS_ACC, len(txpacket), txpacket)
+        comm, error = self.writeTxRx(sts_id, STS_ACC, 1, (acc,))
         if comm == 0 and error == 0:
             return True
         else:
@@ -209,8 +473,7 @@ class ST3215(protocol_packet_handler):
 
         :return: True if the configuration a been succesfully set. None in case of error.
         """
-        txpacket = [self.sts_lobyte(speed), self.sts_hibyte(speed)]
-        comm, error = self.writeTxRx(sts_id, STS_GOAL_SPEED_L, len(txpacket), txpacket)
+        comm, error = self.writeTxRx(sts_id, STS_GOAL_SPEED_L, 2, pack_word(speed, self.sts_end))
         if comm == 0 and error == 0:
             return True
         else:
@@ -225,8 +488,7 @@ class ST3215(protocol_packet_handler):
 
         :return: True if the configuration a been succesfully set. None in case of error.
         """
-        txpacket = [0]
-        comm, error = self.writeTxRx(sts_id, STS_TORQUE_ENABLE, len(txpacket), txpacket)
+        comm, error = self.writeTxRx(sts_id, STS_TORQUE_ENABLE, 1, _TX_TORQUE_OFF)
         if comm == 0 and error == 0:
             return True
         else:
@@ -241,8 +503,7 @@ class ST3215(protocol_packet_handler):
 
         :return: True if the configuration a been succesfully set. None in case of error.
         """
-        txpacket = [1]
-        return self.writeTxRx(sts_id, STS_TORQUE_ENABLE, len(txpacket), txpacket)
+        return self.writeTxRx(sts_id, STS_TORQUE_ENABLE, 1, _TX_TORQUE_ON)
 
 
 
@@ -255,8 +516,12 @@ class ST3215(protocol_packet_handler):
 
         :return: True if the configuration a been succesfully set. None in case of error.
         """
-        txpacket = [mode]
-        return self.writeTxRx(sts_id, STS_MODE, len(txpacket), txpacket)
+        comm, error = self.writeTxRx(sts_id, STS_MODE, 1, (mode,))
+        if comm == 0 and error == 0:
+            self.mode_cache[sts_id] = mode
+        else:
+            self.mode_cache.pop(sts_id, None)
+        return comm, error
 
 
 
@@ -273,12 +538,10 @@ class ST3215(protocol_packet_handler):
         if corr > MAX_CORRECTION:
             corr = MAX_CORRECTION
 
-        txpacket = [self.sts_lobyte(corr), self.sts_hibyte(corr)]
-
         if correction < 0:
-            txpacket[1] |= (1 << 3)
+            corr |= _CORR_SIGN_BIT
 
-        return self.writeTxRx(sts_id, STS_OFS_L, len(txpacket), txpacket)
+        return self.writeTxRx(sts_id, STS_OFS_L, 2, pack_word(corr, self.sts_end))
 
 
     def Rotate(self, sts_id, speed):
@@ -297,12 +560,10 @@ class ST3215(protocol_packet_handler):
         if abs_speed > MAX_SPEED:
             abs_speed = MAX_SPEED
 
-        txpacket = [self.sts_lobyte(abs_speed), self.sts_hibyte(abs_speed)]
-
         if speed < 0:
-            txpacket[1] |= (1 << 7)
+            abs_speed |= (1 << 15)  # direction bit
 
-        return self.writeTxRx(sts_id, STS_GOAL_SPEED_L, len(txpacket), txpacket)
+        return self.writeTxRx(sts_id, STS_GOAL_SPEED_L, 2, pack_word(abs_speed, self.sts_end))
 
 
 
@@ -314,30 +575,97 @@ class ST3215(protocol_packet_handler):
 
         :return: blocking position. None in case of error.
         """
-
         stop_matches = 0
+        interval = 0.02
         while True:
-            moving = self.IsMoving(sts_id)
-            if moving == None:
-                self.SetMode(sts_id, 0)
-                self.StopServo(sts_id)
-                return None
-
-            if moving == False:
-                position = self.ReadPosition(sts_id)
-                self.SetMode(sts_id, 0)
-                self.StopServo(sts_id)
-
-                if position == None:
+            # the lock is taken per poll, so other threads can use the bus between two polls
+            with self.lock:
+                # one read from STS_PRESENT_POSITION_L to STS_MOVING returns both values
+                data, comm, error = self.readTxRx(sts_id, STS_PRESENT_POSITION_L, STS_MOVING - STS_PRESENT_POSITION_L + 1)
+                if comm != 0 or error != 0:
+                    self.SetMode(sts_id, 0)
+                    self.StopServo(sts_id)
                     return None
-                else:
+
+                if not data[STS_MOVING - STS_PRESENT_POSITION_L]:
+                    position = self.sts_makeword(data[0], data[1])
                     stop_matches += 1
+                    if stop_matches == 1:
+                        self.SetMode(sts_id, 0)
+                        self.StopServo(sts_id)
                     if stop_matches > 4:
                         return position
-            else:
-                stop_matches = 0
+                    # confirm the stop quickly
+                    interval = 0.02
+                else:
+                    stop_matches = 0
+                    # poll less often while the servo is still travelling to its end stop
+                    interval = min(interval * 2, 0.1)
+
+            time.sleep(interval)
+
+
+
+    def _poll(self, predicate, timeout, poll, max_poll=0.1):
+        """
+        Call predicate until it returns True, backing off the poll interval
+
+        :param predicate: Function without argument checked at each poll
+        :param timeout: Maximum wait in seconds
+        :param poll: First poll interval in seconds, doubled after each miss
+        :param max_poll: Upper bound of the poll interval in seconds (facultative, 0.1 by default)
+
+        :return: True if predicate returned True before the timeout, otherwise False.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if predicate():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll, remaining))
+            poll = min(poll * 2, max_poll)
+
+
+    def _waitUntilMoving(self, sts_id, timeout=0.5, poll=0.01):
+        """
+        Wait for the servo to start moving
+
+        :param sts_id: Servo ID
+        :param timeout: Maximum wait in seconds (facultative, 0.5 by default)
+        :param poll: First poll interval in seconds (facultative, 0.01 by default)
+
+        :return: True if the servo moves before the timeout, otherwise False.
+        """
+        return self._poll(lambda: self.IsMoving(sts_id) is True, timeout, poll)
+
+
+    def _waitUntilStopped(self, sts_id, timeout=0.5, poll=0.01):
+        """
+        Wait for the servo to stop moving
 
-            time.sleep(0.02)
+        :param sts_id: Servo ID
+        :param timeout: Maximum wait in seconds (facultative, 0.5 by default)
+        :param poll: First poll interval in seconds (facultative, 0.01 by default)
+
+        :return: True if the servo is stopped before the timeout, otherwise False.
+        """
+        return self._poll(lambda: self.IsMoving(sts_id) is False, timeout, poll)
+
+
+    def _waitCorrection(self, sts_id, correction, timeout=0.5, poll=0.01):
+        """
+        Wait for a position correction to be read back from the servo EEPROM
+
+        :param sts_id: Servo ID
+        :param correction: Expected correction value
+        :param timeout: Maximum wait in seconds (facultative, 0.5 by default)
+        :param poll: First poll interval in seconds (facultative, 0.01 by default)
+
+        :return: True if the servo reports the correction before the timeout, otherwise False.
+        """
+        return self._poll(lambda: self.ReadCorrection(sts_id) == correction, timeout, poll)
 
 
 
@@ -349,8 +677,7 @@ class ST3215(protocol_packet_handler):
 
         :return: True if the configuration a been succesfully set. None in case of error.
         """
-        txpacket = [128]
-        comm, error = self.writeTxRx(sts_id, STS_TORQUE_ENABLE, len(txpacket), txpacket)
+        comm, error = self.writeTxRx(sts_id, STS_TORQUE_ENABLE, 1, _TX_TORQUE_NEUTRAL)
         if comm == 0 and error == 0:
             return True
         else:
@@ -368,21 +695,21 @@ class ST3215(protocol_packet_handler):
 
         :return: min and max position in the servo course. None in case of error.
         """
-
         if self.CorrectPosition(sts_id, 0) is None:
             return None, None
 
-        time.sleep(0.5)
+        self._waitCorrection(sts_id, 0)
 
         self.SetAcceleration(sts_id, 100)
         self.Rotate(sts_id, -250)
-        time.sleep(0.5)
+        self._waitUntilMoving(sts_id)
 
         min_position = self.getBlockPosition(sts_id)
 
 
+        self._waitUntilStopped(sts_id)
         self.Rotate(sts_id, 250)
-        time.sleep(0.5)
+        self._waitUntilMoving(sts_id)
 
         max_position = self.getBlockPosition(sts_id)
 
@@ -404,7 +731,7 @@ class ST3215(protocol_packet_handler):
             if self.CorrectPosition(sts_id, corr) is not None:
                 min_position = 0
                 max_position = distance * 2
-                time.sleep(0.5)
+                self._waitCorrection(sts_id, corr)
 
                 self.MoveTo(sts_id, distance)
 
@@ -424,100 +751,278 @@ class ST3215(protocol_packet_handler):
 
         :return: True. None in case of error.
         """
+        with self.lock:
+            comm, error = self.SetMode(sts_id, 0)
+            if comm != 0 or error != 0:
+                return None
 
-        res_mode = self.SetMode(sts_id, 0)
-        res_acc = self.SetAcceleration(sts_id, acc)
-        res_speed = self.SetSpeed(sts_id, speed)
+            if wait == True:
+                curr_pos = self.ReadPosition(sts_id)
+                if curr_pos is None:
+                    return None
 
-        if res_acc == None or res_speed == None or res_mode == None:
-            return None
+            # acceleration, goal position, goal time and speed are adjacent: one write sets them all
+            comm, error = self.writeTxRx(sts_id, STS_ACC, 7, pack_move(acc, speed, position, self.sts_end))
+            if comm != 0 or error != 0:
+                self.target_cache.pop(sts_id, None)
+                return None
+            self.target_cache[sts_id] = position
+
+        # waiting is only IsMoving polling, each read takes the lock by itself
+        if wait == True:
+            self._waitMove(sts_id, self._moveDuration(abs(position - curr_pos), speed, acc))
+
+        return True
+
+
+
+    def _moveDuration(self, distance, speed, acc):
+        """
+        Estimate the duration of a move from the speed / acceleration profile
+
+        :param distance: Distance to travel in steps
+        :param speed: Move speed in step/s
+        :param acc: Acceleration value (Unit: 100 step/s^2)
+
+        :return: Estimated duration in s
+        """
+        if speed <= 0:
+            # no usable speed to estimate from, _waitMove falls back to its minimum budget
+            return 0
+        if acc <= 0:
+            # acc 0: no ramp, the whole move is done at constant speed
+            return distance / speed
+
+        time_to_speed = speed / (acc * 100)
+
+        distance_acc = 0.5 * (acc * 100) * time_to_speed ** 2
+
+        if distance_acc >= distance:
+            return math.sqrt(2 * distance / (acc * 100))
+        else:
+            remain_distance = distance - distance_acc
+            return time_to_speed + (remain_distance / speed)
+
+
+
+    def _waitMove(self, sts_id, duration):
+        """
+        Wait for the end of a move, polling the servo instead of sleeping for the whole estimated duration
+
+        :param sts_id: Servo ID
+        :param duration: Estimated duration of the move in s (see _moveDuration)
+
+        :return: True if the servo stopped, False if it is still moving after 1.5 times the estimated duration.
+        """
+        # a wrong estimate (e.g. distance 0) must not turn the wait into no wait at all
+        duration = max(duration, _MIN_MOVE_DURATION)
+        # give the servo time to start before the first poll
+        start = min(duration / 4, 0.05)
+        time.sleep(start)
+        interval = max(0.01, duration / 10)
+        # fixed interval: the move length is known, there is nothing to back off from
+        return self._poll(lambda: self.IsMoving(sts_id) is False, 1.5 * duration - start, interval, interval)
+
+
+
+    def MoveToFast(self, sts_id, position, speed = 2400, acc = 50, wait = False):
+        """
+        Move the servo to a pre defined position with a single packet.
+        Unlike MoveTo, acceleration, goal position and speed are sent as a sync write, which gets
+        no status reply, and the position mode is only set when it is not known to be active already.
+
+        :param sts_id: Servo ID
+        :param position: New position of the Servo
+        :param speed: Move speed in step/s (facultative, 2400 by default)
+        :param acc: Accelaration speed in step/s² (facultative, 50 by default)
+        :param wait: Wait the position to be reached before the function return (facultative, False by default)
+
+        :return: True. None in case of error.
+        """
+        if self.mode_cache.get(sts_id) != 0:
+            comm, error = self.SetMode(sts_id, 0)
+            if comm != 0 or error != 0:
+                return None
+
+        if wait == True:
+            # distance from the last target sent, only read the servo when unknown
+            curr_pos = self.target_cache.get(sts_id)
+            if curr_pos is None:
+                curr_pos = self.ReadPosition(sts_id)
+                if curr_pos is None:
+                    return None
+
+        txpacket = pack_move(acc, speed, position, self.sts_end)
 
-        curr_pos = self.ReadPosition(sts_id) 
+        with self.lock:
+            self.groupSyncWrite.clearParam()
+            self.groupSyncWrite.addParam(sts_id, txpacket)
+            comm = self.groupSyncWrite.txPacket()
 
-        res_pos = self.WritePosition(sts_id, position)
-        if res_pos == None:
+        if comm != COMM_SUCCESS:
+            self.target_cache.pop(sts_id, None)
             return None
+        self.target_cache[sts_id] = position
 
         if wait == True:
-            if position == None:
-                return None
-            else:
-                distance = abs(position - curr_pos)
+            self._waitMove(sts_id, self._moveDuration(abs(position - curr_pos), speed, acc))
 
-            time_to_speed = speed / (acc * 100)
+        return True
 
-            distance_acc = 0.5 * (acc * 100) * time_to_speed ** 2
 
-            if distance_acc >= distance:
-                time_wait = math.sqrt(2 * distance / acc)
-            else:
-                remain_distance = distance - distance_acc
-                time_wait = time_to_speed + (remain_distance / speed)
 
-            time.sleep(time_wait)
+    def MoveMany(self, targets):
+        """
+        Move several servos with a single sync write packet.
+        All servos receive their goal in the same packet, so they start moving together.
+
+        :param targets: dict of Servo ID -> (position, speed, acc)
+
+        :return: True. None in case of error.
+        """
+        for sts_id in targets:
+            if self.mode_cache.get(sts_id) != 0:
+                comm, error = self.SetMode(sts_id, 0)
+                if comm != 0 or error != 0:
+                    return None
+
+        with self.lock:
+            self.groupSyncWrite.clearParam()
+            for sts_id, (position, speed, acc) in targets.items():
+                self.groupSyncWrite.addParam(sts_id, pack_move(acc, speed, position, self.sts_end))
+            comm = self.groupSyncWrite.txPacket()
+
+        if comm != COMM_SUCCESS:
+            for sts_id in targets:
+                self.target_cache.pop(sts_id, None)
+            return None
+        for sts_id, (position, speed, acc) in targets.items():
+            self.target_cache[sts_id] = position
+
+        return True
+
+
+
+    def WritePositions(self, positions):
+        """
+        Write the goal position of several servos with a single sync write packet
+
+        :param positions: dict of Servo ID -> position
+
+        :return: True. None in case of error.
+        """
+        groupSyncWrite = GroupSyncWrite(self, STS_GOAL_POSITION_L, 2)
+        for sts_id, position in positions.items():
+            groupSyncWrite.addParam(sts_id, pack_word(position, self.sts_end))
+
+        with self.lock:
+            comm = groupSyncWrite.txPacket()
+
+        if comm != COMM_SUCCESS:
+            for sts_id in positions:
+                self.target_cache.pop(sts_id, None)
+            return None
+        self.target_cache.update(positions)
 
         return True
 
 
 
     def WritePosition(self, sts_id, position):
-        txpacket = [self.sts_lobyte(position), self.sts_hibyte(position)]
-        comm, error = self.writeTxRx(sts_id, STS_GOAL_POSITION_L, len(txpacket), txpacket)
+        comm, error = self.writeTxRx(sts_id, STS_GOAL_POSITION_L, 2, pack_word(position, self.sts_end))
         if comm == 0 and error == 0:
+            self.target_cache[sts_id] = position
             return True
         else:
             return None
 
 
-    def ReadStatus(self, sts_id):
+    def ReadStatus(self, sts_id, max_age=0):
         """
         Get the sensors status
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: dict of sensor status in case of success, otherwise None
         """
-        status_bits = ["Voltage", "Sensor", "Temperature", "Current", "Angle", "Overload"]
-
-        status = {}
-
-        status_byte, comm, error =  self.read1ByteTxRx(sts_id, STS_STATUS)
+        status_byte, comm, error = self._readCached(sts_id, STS_STATUS, 1, max_age)
         if comm != 0 or error != 0:
             return None
 
-
-        for i in range(6):
-            if status_byte & (1 << i):
-                status[status_bits[i]] = False
-            else:
-                status[status_bits[i]] = True
-
-        return status
+        # copy so callers can't alter the shared table entry
+        return dict(_STATUS_TABLE[status_byte & 0x3F])
 
 
-    def ReadPosition(self, sts_id):
+    def ReadPosition(self, sts_id, max_age=0):
         """
         Get the current position
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: position in case of success, otherwise None
         """
-        position, comm, error = self.read2ByteTxRx(sts_id, STS_PRESENT_POSITION_L)
+        position, comm, error = self._readCached(sts_id, STS_PRESENT_POSITION_L, 2, max_age)
         if comm == 0 and error == 0:
             return position
         else:
             return None
 
-    def ReadSpeed(self, sts_id):
+    def ReadMany(self, sts_ids, address, length):
+        """
+        Read the same registers of several servos with a single sync read packet.
+
+        :param sts_ids: List of Servo ID
+        :param address: First register address
+        :param length: Number of bytes to read from address
+
+        :return: dict of Servo ID -> bytes read. Servos that did not answer or reported an error are missing.
+        """
+        groupSyncRead = GroupSyncRead(self, address, length)
+        for sts_id in sts_ids:
+            groupSyncRead.addParam(sts_id)
+
+        with self.lock:
+            groupSyncRead.txRxPacket()
+
+        data = {}
+        for sts_id in sts_ids:
+            available, error = groupSyncRead.isAvailable(sts_id, address, length)
+            if available and error == 0:
+                data[sts_id] = bytes(groupSyncRead.getDataBlock(sts_id, address, length))
+        return data
+
+
+    def ReadPositions(self, sts_ids):
+        """
+        Get the current position of several servos with a single sync read packet.
+        The positions read are also cached for ReadPosition(max_age).
+
+        :param sts_ids: List of Servo ID
+
+        :return: dict of Servo ID -> position. Servos that did not answer or reported an error are missing.
+        """
+        byteorder = 'little' if self.sts_end == 0 else 'big'
+        positions = {sts_id: int.from_bytes(data, byteorder)
+                     for sts_id, data in self.ReadMany(sts_ids, STS_PRESENT_POSITION_L, 2).items()}
+
+        now = time.monotonic()
+        with self.lock:
+            for sts_id, position in positions.items():
+                self.read_cache.setdefault(sts_id, {})[STS_PRESENT_POSITION_L] = (now, position)
+        return positions
+
+    def ReadSpeed(self, sts_id, max_age=0):
         """
         Get the current speed
 
         :param sts_id: Servo ID
+        :param max_age: Accept a cached value up to this age in seconds (facultative, 0 by default: always read the servo)
 
         :return: speed in case of success, otherwise None
         """
-        sts_present_speed, sts_comm_result, sts_error = self.read2ByteTxRx(sts_id, STS_PRESENT_SPEED_L)
+        sts_present_speed, sts_comm_result, sts_error = self._readCached(sts_id, STS_PRESENT_SPEED_L, 2, max_age)
         return self.sts_tohost(sts_present_speed, 15), sts_comm_result, sts_error
 
 
@@ -551,20 +1056,49 @@ class ST3215(protocol_packet_handler):
 
         :return: None when sucedeed otherwise the error message 
         """
-        if isinstance(new_id, int) and 0 <= new_id <= 253:
-            if not self.PingServo(sts_id):
-                return f"Could not find servo: {sts_id}" 
-
-            if self.UnLockEprom(sts_id) != COMM_SUCCESS:
-                return "Could not unlock Eprom" 
-
-            if self.write1ByteTxOnly(sts_id, STS_ID, new_id) != COMM_SUCCESS:
-                return "Could not change Servo ID" 
-
-            self.LockEprom(sts_id)
-            return None
-        else:
-            return "new_id is not between 0 and 253" 
+        with self.lock:
+            if isinstance(new_id, int) and 0 <= new_id <= 253:
+                # a broadcast unlock succeeds without any status reply and would renumber every servo
+                if sts_id >= BROADCAST_ID:
+                    return f"Could not find servo: {sts_id}"
+
+                # nothing to write, only report whether the servo is there
+                if sts_id == new_id:
+                    return None if self.PingServo(sts_id) else f"Could not find servo: {sts_id}"
+
+                # the status packet of the unlock tells whether the servo is there, no ping needed
+                comm, error = self.write1ByteTxRx(sts_id, STS_LOCK, 0)
+                if comm != COMM_SUCCESS:
+                    return f"Could not find servo: {sts_id}" 
+                if error != 0:
+                    return "Could not unlock Eprom" 
+
+                if self.write1ByteTxOnly(sts_id, STS_ID, new_id) != COMM_SUCCESS:
+                    return "Could not change Servo ID" 
+
+                # the ID write is answered too, from the old or the new ID: read that status packet
+                # here and drop anything left, so the lock below cannot take it for its own reply
+                self.portHandler.setPacketTimeout(6)
+                rxpacket, comm = self.rxPacket()
+                self.portHandler.clearInput()
+
+                # the old ID is free now, and nothing known about new_id applies to this servo
+                self._forgetServo(sts_id)
+                self._forgetServo(new_id)
+                self.InvalidateListCache()
+
+                if comm != COMM_SUCCESS or rxpacket[PKT_ERROR] != 0:
+                    self.LockEprom(sts_id)
+                    return "Could not change Servo ID" 
+
+                # locking through the new ID confirms the servo answers to it
+                comm, error = self.write1ByteTxRx(new_id, STS_LOCK, 1)
+                if comm != COMM_SUCCESS or error != 0:
+                    self.LockEprom(sts_id)
+                    return "Could not change Servo ID" 
+                return None
+            else:
+                return "new_id is not between 0 and 253" 
 
     def ChangeBaudrate(self, sts_id, new_baudrate):
         """
@@ -575,20 +1109,24 @@ class ST3215(protocol_packet_handler):
 
         :return: None when sucedeed otherwise the error message 
         """
-        if isinstance(new_baudrate, int) and 0 <= new_baudrate <= 7:
+        with self.lock:
+            if isinstance(new_baudrate, int) and 0 <= new_baudrate <= 7:
             
-            if not self.PingServo(sts_id):
-                return f"Could not find servo: {sts_id}" 
+                if not self.PingServo(sts_id):
+                    return f"Could not find servo: {sts_id}" 
 
-            if self.UnLockEprom(sts_id) != COMM_SUCCESS:
-                return "Could not unlock Eprom" 
+                if self.UnLockEprom(sts_id) != COMM_SUCCESS:
+                    return "Could not unlock Eprom" 
 
-            if self.write1ByteTxOnly(sts_id, STS_BAUD_RATE, new_baudrate) != COMM_SUCCESS:
-                return "Could not change Servo Baudrate" 
+                if self.write1ByteTxOnly(sts_id, STS_BAUD_RATE, new_baudrate) != COMM_SUCCESS:
+                    return "Could not change Servo Baudrate" 
 
-            self.LockEprom(sts_id)
-            return None
-        else:
-            return "baudrate is not valid"
+                self.LockEprom(sts_id)
+                # the servo no longer answers at the current baudrate
+                self._forgetServo(sts_id)
+                self.InvalidateListCache()
+                return None
+            else:
+                return "baudrate is not valid"
     
 
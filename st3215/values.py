@@ -11,6 +11,10 @@ MAX_SPEED = 3400
 
 MAX_CORRECTION = 2047
 
+# Units of the raw voltage and current registers
+VOLTAGE_SCALE = 0.1  # V
+CURRENT_SCALE = 6.5  # mA
+
 # for Protocol Packet
 PKT_HEADER_0 = 0
 PKT_HEADER_1 = 1
@@ -26,6 +30,7 @@ ERRBIT_ANGLE = 2
 ERRBIT_OVERHEAT = 4
 ERRBIT_OVERELE = 8
 ERRBIT_OVERLOAD = 32
+ERRBIT_MASK = ERRBIT_VOLTAGE | ERRBIT_ANGLE | ERRBIT_OVERHEAT | ERRBIT_OVERELE | ERRBIT_OVERLOAD  # 0x2F
 
 
 BROADCAST_ID = 0xFE  # 254
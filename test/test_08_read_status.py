@@ -8,6 +8,8 @@ import os
 import sys
 from st3215 import ST3215
 
+EXPECTED_STATUS_KEYS = frozenset({"Voltage", "Sensor", "Temperature", "Current", "Angle", "Overload"})
+
 def main():
     print("=== ST3215 Status Test ===")
     
@@ -33,6 +35,10 @@ def main():
         status = servo.ReadStatus(servo_id)
         
         if status is not None:
+            if not EXPECTED_STATUS_KEYS.issubset(status):
+                print(f"❌ Missing sensor status: {', '.join(sorted(EXPECTED_STATUS_KEYS.difference(status)))}")
+                sys.exit(1)
+
             print("✓ Sensor Status:")
             
             # Display each sensor status
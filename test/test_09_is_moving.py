@@ -9,6 +9,16 @@ import sys
 import time
 from st3215 import ST3215
 
+def wait_for_stop(servo, servo_id, timeout=3.0):
+    """Poll IsMoving until the servo stops. Returns the last status read."""
+    deadline_ns = time.monotonic_ns() + int(timeout * 1e9)
+    moving = servo.IsMoving(servo_id)
+    while moving is not False and time.monotonic_ns() < deadline_ns:
+        # poll fast while the servo moves, back off while the status is unreadable
+        time.sleep(0.02 if moving else 0.1)
+        moving = servo.IsMoving(servo_id)
+    return moving
+
 def main():
     print("=== ST3215 Motion Detection Test ===")
     
@@ -80,9 +90,7 @@ def main():
         
         # Wait for movement to complete and check again
         print("Step 4: Waiting for movement to complete...")
-        time.sleep(2)  # Wait for movement to finish
-        
-        is_moving_final = servo.IsMoving(servo_id)
+        is_moving_final = wait_for_stop(servo, servo_id)
         if is_moving_final is None:
             print("❌ Failed to read final motion status")
         else:
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test 13: ListServosFast
+Scans the bus with a sync read and compares the result with ListServos.
+"""
+
+import os
+import sys
+import time
+from st3215 import ST3215
+
+def main():
+    print("=== ST3215 List Servos Fast Test ===")
+
+    # Get device from environment variable
+    device = os.getenv('ST3215_DEV')
+    if not device:
+        print("❌ Error: ST3215_DEV environment variable not set")
+        print("   Please set it to your serial device (e.g., /dev/ttyUSB0)")
+        sys.exit(1)
+
+    print(f"Device: {device}")
+
+    try:
+        # Initialize servo controller
+        servo = ST3215(device)
+        print("✓ Serial connection established")
+
+        # Reference scan, one ping per ID
+        print("Scanning bus with ListServos (one ping per ID)...")
+        start = time.monotonic()
+        servo_list = servo.ListServos()
+        ping_time = time.monotonic() - start
+
+        if not servo_list:
+            print("❌ No servos found on the bus")
+            print("   Check connections and power supply")
+            sys.exit(1)
+
+        print(f"✓ ListServos found {servo_list} in {ping_time:.2f}s")
+
+        # Sync read only
+        print("Scanning bus with ListServosFast(fallback=False)...")
+        start = time.monotonic()
+        fast_list = servo.ListServosFast(fallback=False)
+        fast_time = time.monotonic() - start
+        print(f"✓ ListServosFast(fallback=False) found {fast_list} in {fast_time:.2f}s")
+
+        if fast_list != servo_list:
+            print("⚠️  Warning: the sync read alone missed or added servos")
+            print("   Replies may collide on the bus, fallback=True covers this")
+
+        # Sync read, then ping the IDs that did not answer
+        print("Scanning bus with ListServosFast(fallback=True)...")
+        start = time.monotonic()
+        fallback_list = servo.ListServosFast(fallback=True)
+        fallback_time = time.monotonic() - start
+        print(f"✓ ListServosFast(fallback=True) found {fallback_list} in {fallback_time:.2f}s")
+
+        if fallback_list != servo_list:
+            print("❌ ListServosFast(fallback=True) and ListServos do not agree")
+            sys.exit(1)
+
+        print("✓ ListServosFast(fallback=True) matches ListServos")
+        print("Test completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Error during test: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
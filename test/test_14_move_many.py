@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test 14: MoveMany & WritePositions
+Moves all the servos of the bus with a single sync write packet.
+"""
+
+import os
+import sys
+import time
+from st3215 import ST3215
+
+def wait_all_stopped(servo, servo_ids, timeout=3.0):
+    """Poll IsMoving until every servo stops. Returns the list of servos still moving."""
+    deadline = time.monotonic() + timeout
+    moving = list(servo_ids)
+    while moving:
+        moving = [servo_id for servo_id in moving if servo.IsMoving(servo_id) is not False]
+        if not moving or time.monotonic() >= deadline:
+            break
+        time.sleep(0.02)
+    return moving
+
+def check_positions(servo, targets, tolerance=20):
+    """Compare the position read back with the targets. Returns True if all servos reached their target."""
+    positions = {servo_id: servo.ReadPosition(servo_id) for servo_id in targets}
+    ok = True
+    for servo_id, target in targets.items():
+        position = positions[servo_id]
+        if position is None or abs(position - target) > tolerance:
+            print(f"❌ Servo ID {servo_id}: position {position}, expected {target}")
+            ok = False
+        else:
+            print(f"✓ Servo ID {servo_id}: position {position} (target {target})")
+    return ok
+
+def main():
+    print("=== ST3215 Move Many Test ===")
+
+    # Get device from environment variable
+    device = os.getenv('ST3215_DEV')
+    if not device:
+        print("❌ Error: ST3215_DEV environment variable not set")
+        print("   Please set it to your serial device (e.g., /dev/ttyUSB0)")
+        sys.exit(1)
+
+    print(f"Device: {device}")
+
+    try:
+        # Initialize servo controller
+        servo = ST3215(device)
+        print("✓ Serial connection established")
+
+        servo_ids = servo.ListServosFast(fallback=True)
+        if not servo_ids:
+            print("❌ No servos found on the bus")
+            print("   Check connections and power supply")
+            sys.exit(1)
+
+        print(f"✓ Servos used for this test: {servo_ids}")
+
+        start_positions = {}
+        for servo_id in servo_ids:
+            comm, error = servo.StartServo(servo_id)
+            if comm != 0 or error != 0:
+                print(f"❌ Failed to start servo ID {servo_id}")
+                sys.exit(1)
+            position = servo.ReadPosition(servo_id)
+            if position is None:
+                print(f"❌ Failed to read position of servo ID {servo_id}")
+                sys.exit(1)
+            start_positions[servo_id] = position
+
+        print(f"✓ Start positions: {start_positions}")
+
+        # Step 1: goal position, speed and acceleration of every servo in one packet
+        targets = {servo_id: position + 500 if position < 2048 else position - 500
+                   for servo_id, position in start_positions.items()}
+        print(f"\nStep 1: MoveMany to {targets}...")
+        if not servo.MoveMany({servo_id: (target, 1500, 50) for servo_id, target in targets.items()}):
+            print("❌ MoveMany failed")
+            sys.exit(1)
+
+        still_moving = wait_all_stopped(servo, servo_ids)
+        if still_moving:
+            print(f"⚠️  Warning: servos {still_moving} still moving after timeout")
+        if not check_positions(servo, targets):
+            sys.exit(1)
+
+        # Step 2: goal position only, speed and acceleration of step 1 are kept
+        print(f"\nStep 2: WritePositions back to {start_positions}...")
+        if not servo.WritePositions(start_positions):
+            print("❌ WritePositions failed")
+            sys.exit(1)
+
+        still_moving = wait_all_stopped(servo, servo_ids)
+        if still_moving:
+            print(f"⚠️  Warning: servos {still_moving} still moving after timeout")
+        if not check_positions(servo, start_positions):
+            sys.exit(1)
+
+        for servo_id in servo_ids:
+            servo.StopServo(servo_id)
+        print("✓ Servos disabled")
+
+        print("Test completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Error during test: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
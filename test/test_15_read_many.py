@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test 15: ReadMany & ReadPositions
+Reads registers of all the servos of the bus with a single sync read packet.
+"""
+
+import os
+import sys
+from st3215 import ST3215
+from st3215.values import STS_PRESENT_VOLTAGE, VOLTAGE_SCALE
+
+def main():
+    print("=== ST3215 Read Many Test ===")
+
+    # Get device from environment variable
+    device = os.getenv('ST3215_DEV')
+    if not device:
+        print("❌ Error: ST3215_DEV environment variable not set")
+        print("   Please set it to your serial device (e.g., /dev/ttyUSB0)")
+        sys.exit(1)
+
+    print(f"Device: {device}")
+
+    try:
+        # Initialize servo controller
+        servo = ST3215(device)
+        print("✓ Serial connection established")
+
+        servo_ids = servo.ListServosFast(fallback=True)
+        if not servo_ids:
+            print("❌ No servos found on the bus")
+            print("   Check connections and power supply")
+            sys.exit(1)
+
+        print(f"✓ Servos used for this test: {servo_ids}")
+
+        # Step 1: positions of every servo in one packet, compared with one read per servo
+        print("\nStep 1: ReadPositions...")
+        positions = servo.ReadPositions(servo_ids)
+        missing = [servo_id for servo_id in servo_ids if servo_id not in positions]
+        if missing:
+            print(f"❌ No position read for servos {missing}")
+            sys.exit(1)
+
+        for servo_id in servo_ids:
+            position = servo.ReadPosition(servo_id)
+            if position is None or abs(position - positions[servo_id]) > 5:
+                print(f"❌ Servo ID {servo_id}: ReadPositions gave {positions[servo_id]}, ReadPosition gives {position}")
+                sys.exit(1)
+            print(f"✓ Servo ID {servo_id}: position {positions[servo_id]}")
+
+        # Step 2: two adjacent registers of every servo in one packet
+        print("\nStep 2: ReadMany of voltage and temperature...")
+        data = servo.ReadMany(servo_ids, STS_PRESENT_VOLTAGE, 2)
+        missing = [servo_id for servo_id in servo_ids if servo_id not in data]
+        if missing:
+            print(f"❌ No data read for servos {missing}")
+            sys.exit(1)
+
+        for servo_id in servo_ids:
+            voltage, temperature = data[servo_id]
+            print(f"✓ Servo ID {servo_id}: voltage {voltage * VOLTAGE_SCALE:.1f}V, temperature {temperature}°C")
+            if servo.ReadTemperature(servo_id) != temperature:
+                print(f"⚠️  Warning: ReadTemperature of servo ID {servo_id} differs from ReadMany")
+
+        print("Test completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Error during test: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()